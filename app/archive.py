@@ -0,0 +1,204 @@
+"""
+Archival raw scans dan movement history.
+
+- scans dari sesi CLOSED -> stock_opname_scans_archive
+- movements yang created_at <= cutoff -> inventory_movements_archive,
+  cutoff = min(snapshot_at sesi yang belum CLOSED, now - ARCHIVE_MOVEMENT_MIN_AGE_DAYS)
+
+Data dipindah per chunk (INSERT ... SELECT lalu DELETE dalam satu
+transaksi) supaya tabel hot tetap kecil tanpa lock panjang. Job ini
+aman dijalankan berulang: `python -m app.cli archive`.
+"""
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import settings
+
+ARCHIVE_CHUNK_SIZE = 10000
+
+SCAN_COLUMNS = (
+    "id",
+    "session_id",
+    "tag_uid",
+    "item_id",
+    "zone",
+    "scanned_at",
+    "scanned_by",
+    "created_at",
+)
+
+MOVEMENT_COLUMNS = (
+    "id",
+    "item_id",
+    "location_id",
+    "qty_change",
+    "reason",
+    "reference_id",
+    "created_at",
+)
+
+ProgressCallback = Callable[[str, int], None]
+
+
+def _move_chunk(db: Session, hot, archive, columns: tuple[str, ...], ids: list[int]):
+    hot_table = hot.__table__
+    archive_table = archive.__table__
+    now = datetime.utcnow()
+
+    db.execute(
+        insert(archive_table).from_select(
+            [*columns, "archived_at"],
+            select(*(hot_table.c[c] for c in columns), literal(now)).where(
+                hot_table.c.id.in_(ids)
+            ),
+        )
+    )
+    db.execute(delete(hot_table).where(hot_table.c.id.in_(ids)))
+
+
+def _archive(
+    db: Session,
+    hot,
+    archive,
+    columns: tuple[str, ...],
+    condition,
+    label: str,
+    chunk_size: int,
+    on_progress: ProgressCallback | None,
+) -> int:
+    moved = 0
+    while True:
+        ids = [
+            row[0]
+            for row in db.query(hot.id)
+            .filter(condition)
+            .order_by(hot.id)
+            .limit(chunk_size)
+            .all()
+        ]
+        if not ids:
+            break
+
+        _move_chunk(db, hot, archive, columns, ids)
+        db.commit()
+
+        moved += len(ids)
+        if on_progress:
+            on_progress(label, moved)
+
+    return moved
+
+
+# ==============================
+# Scans dari sesi CLOSED
+# ==============================
+def archive_closed_session_scans(
+    db: Session,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> int:
+    closed_sessions = select(models.StockOpnameSession.id).where(
+        models.StockOpnameSession.status == "CLOSED"
+    )
+    return _archive(
+        db,
+        models.StockOpnameScan,
+        models.StockOpnameScanArchive,
+        SCAN_COLUMNS,
+        models.StockOpnameScan.session_id.in_(closed_sessions),
+        "scans",
+        chunk_size,
+        on_progress,
+    )
+
+
+# ==============================
+# Movements lebih tua dari semua snapshot sesi yang masih terbuka
+# ==============================
+def movement_archive_cutoff(db: Session, now: datetime | None = None) -> datetime:
+    """
+    compute_movement_qty_for_item hanya membaca movement dengan
+    created_at > snapshot_at, jadi yang <= snapshot tertua sesi terbuka
+    tidak dibutuhkan lagi oleh tabel hot.
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.ARCHIVE_MOVEMENT_MIN_AGE_DAYS)
+
+    oldest_open_snapshot = (
+        db.query(func.min(models.StockOpnameSession.snapshot_at))
+        .filter(models.StockOpnameSession.status != "CLOSED")
+        .scalar()
+    )
+    if oldest_open_snapshot is not None:
+        cutoff = min(cutoff, oldest_open_snapshot)
+
+    return cutoff
+
+
+def archive_old_movements(
+    db: Session,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> int:
+    cutoff = movement_archive_cutoff(db)
+    return _archive(
+        db,
+        models.InventoryMovement,
+        models.InventoryMovementArchive,
+        MOVEMENT_COLUMNS,
+        models.InventoryMovement.created_at <= cutoff,
+        "movements",
+        chunk_size,
+        on_progress,
+    )
+
+
+# ==============================
+# Read path: hot + archive
+# ==============================
+def _union(hot, archive, columns: tuple[str, ...], *filters):
+    hot_table = hot.__table__
+    archive_table = archive.__table__
+
+    def part(table):
+        q = select(*(table.c[c] for c in columns))
+        for build in filters:
+            q = q.where(build(table))
+        return q
+
+    return union_all(part(hot_table), part(archive_table)).subquery()
+
+
+def list_movements_with_archive(
+    db: Session,
+    item_id: int | None = None,
+    location_id: int | None = None,
+    limit: int = 200,
+):
+    filters = []
+    if item_id:
+        filters.append(lambda t: t.c.item_id == item_id)
+    if location_id:
+        filters.append(lambda t: t.c.location_id == location_id)
+
+    movements = _union(
+        models.InventoryMovement, models.InventoryMovementArchive, MOVEMENT_COLUMNS, *filters
+    )
+    return db.execute(
+        select(movements).order_by(movements.c.created_at.desc()).limit(limit)
+    ).all()
+
+
+def get_session_scans(db: Session, session_id: int, limit: int = 1000, offset: int = 0):
+    scans = _union(
+        models.StockOpnameScan,
+        models.StockOpnameScanArchive,
+        SCAN_COLUMNS,
+        lambda t: t.c.session_id == session_id,
+    )
+    return db.execute(
+        select(scans).order_by(scans.c.id).limit(limit).offset(offset)
+    ).all()
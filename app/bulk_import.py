@@ -0,0 +1,430 @@
+"""
+Streaming bulk import untuk item master, RFID tag dan item location.
+
+File dibaca baris per baris (CSV atau NDJSON) lalu di-upsert per batch
+dengan INSERT ... ON DUPLICATE KEY UPDATE, sehingga memory tetap kecil
+berapapun ukuran file-nya.
+"""
+import csv
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Iterable, Iterator, TextIO
+
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from . import migrations, models, schemas
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+RFID_STATUSES = ("ACTIVE", "LOST", "DAMAGED")
+
+ProgressCallback = Callable[[schemas.ImportReport], None]
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportAborted(RuntimeError):
+    """
+    Error database yang bukan salah baris (koneksi putus, lock wait
+    timeout, ...). Batch yang sudah di-commit tetap tersimpan; report
+    berisi progress sampai titik ini.
+    """
+
+    def __init__(self, error: SQLAlchemyError, report: schemas.ImportReport):
+        super().__init__(f"import aborted: {_db_error(error)}")
+        self.report = report
+
+
+# error per baris (constraint / nilai tidak valid); selain ini import dihentikan
+ROW_LEVEL_ERRORS = (IntegrityError, DataError)
+
+
+# ==============================
+# Reading CSV / NDJSON
+# ==============================
+def detect_format(filename: str | None) -> str:
+    if filename and filename.lower().endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    return "csv"
+
+
+def iter_records(stream: TextIO, fmt: str = "csv") -> Iterator[tuple[int, dict | str]]:
+    """
+    Yield (line_no, record). Untuk NDJSON record masih berupa text mentah,
+    di-parse per baris supaya JSON yang rusak tercatat sebagai row error.
+    """
+    if fmt == "ndjson":
+        for line_no, line in enumerate(stream, start=1):
+            if line.strip():
+                yield line_no, line
+        return
+
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _as_dict(record: dict | str) -> dict:
+    if isinstance(record, dict):
+        return record
+    try:
+        value = json.loads(record)
+    except json.JSONDecodeError as e:
+        raise RowError(f"Invalid JSON: {e.msg}")
+    if not isinstance(value, dict):
+        raise RowError("Expected a JSON object")
+    return value
+
+
+# ==============================
+# Field helpers
+# ==============================
+def _present(record: dict, key: str) -> bool:
+    value = record.get(key)
+    return value is not None and str(value).strip() != ""
+
+
+def _required(record: dict, key: str) -> str:
+    if not _present(record, key):
+        raise RowError(f"Missing required field '{key}'")
+    return str(record[key]).strip()
+
+
+def _decimal(record: dict, key: str) -> Decimal:
+    try:
+        return Decimal(str(record[key]).strip())
+    except InvalidOperation:
+        raise RowError(f"Invalid number for '{key}': {record[key]!r}")
+
+
+def _int(record: dict, key: str) -> int:
+    try:
+        return int(str(record[key]).strip())
+    except ValueError:
+        raise RowError(f"Invalid integer for '{key}': {record[key]!r}")
+
+
+def _item_ref(record: dict, row: dict):
+    if _present(record, "item_id"):
+        row["item_id"] = _int(record, "item_id")
+    elif _present(record, "sku"):
+        row["sku"] = str(record["sku"]).strip()
+    else:
+        raise RowError("Missing required field 'item_id' or 'sku'")
+
+
+def _location_ref(record: dict, row: dict, required: bool):
+    if _present(record, "location_id"):
+        row["location_id"] = _int(record, "location_id")
+    elif _present(record, "location_code"):
+        row["location_code"] = str(record["location_code"]).strip()
+    elif required:
+        raise RowError("Missing required field 'location_id' or 'location_code'")
+
+
+def _add_error(report: schemas.ImportReport, line: int, error: str):
+    report.error_count += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append(schemas.ImportRowError(line=line, error=error))
+
+
+# ==============================
+# Resolve sku / location_code to id, cek item_id / location_id (per batch)
+# ==============================
+def _existing_ids(db: Session, model, ids: set[int]) -> set[int]:
+    if not ids:
+        return set()
+    return {row[0] for row in db.query(model.id).filter(model.id.in_(ids)).all()}
+
+
+def _resolve_refs(
+    db: Session,
+    batch: list[tuple[int, dict]],
+    report: schemas.ImportReport,
+) -> list[tuple[int, dict]]:
+    """
+    Ubah sku / location_code jadi id, dan tolak id yang tidak ada per baris
+    (bukan lewat foreign key error yang menggagalkan satu batch penuh).
+    """
+    skus = {row["sku"] for _, row in batch if "sku" in row}
+    codes = {row["location_code"] for _, row in batch if "location_code" in row}
+
+    sku_map = dict(
+        db.query(models.Item.sku, models.Item.id).filter(models.Item.sku.in_(skus)).all()
+    ) if skus else {}
+    code_map = dict(
+        db.query(models.Location.code, models.Location.id)
+        .filter(models.Location.code.in_(codes))
+        .all()
+    ) if codes else {}
+    item_ids = _existing_ids(
+        db, models.Item, {row["item_id"] for _, row in batch if "item_id" in row}
+    )
+    location_ids = _existing_ids(
+        db, models.Location, {row["location_id"] for _, row in batch if "location_id" in row}
+    )
+
+    resolved = []
+    for line_no, row in batch:
+        row = dict(row)
+        if "sku" in row:
+            item_id = sku_map.get(row.pop("sku"))
+            if item_id is None:
+                _add_error(report, line_no, "Unknown sku")
+                continue
+            row["item_id"] = item_id
+        elif row["item_id"] not in item_ids:
+            _add_error(report, line_no, "Unknown item_id")
+            continue
+
+        if "location_code" in row:
+            location_id = code_map.get(row.pop("location_code"))
+            if location_id is None:
+                _add_error(report, line_no, "Unknown location_code")
+                continue
+            row["location_id"] = location_id
+        elif "location_id" in row and row["location_id"] not in location_ids:
+            _add_error(report, line_no, "Unknown location_id")
+            continue
+
+        resolved.append((line_no, row))
+    return resolved
+
+
+def _upsert(db: Session, model, rows: list[dict], key_columns: tuple[str, ...]):
+    """
+    Upsert rows, dikelompokkan per set kolom supaya kolom yang tidak ada
+    di file tidak menimpa data lama.
+    """
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        stmt = insert(model)
+        update_columns = [c for c in columns if c not in key_columns]
+        stmt = stmt.on_duplicate_key_update(
+            {c: stmt.inserted[c] for c in update_columns}
+        )
+        db.execute(stmt, group)
+
+
+# ==============================
+# Import engine
+# ==============================
+ResolveBatch = Callable[
+    [Session, list[tuple[int, dict]], schemas.ImportReport], list[tuple[int, dict]]
+]
+WriteRows = Callable[[Session, list[dict]], None]
+
+
+def _db_error(e: SQLAlchemyError) -> str:
+    return str(getattr(e, "orig", None) or e)[:500]
+
+
+def _write_isolating_errors(
+    db: Session,
+    rows: list[tuple[int, dict]],
+    write_rows: WriteRows,
+    report: schemas.ImportReport,
+) -> int:
+    """
+    Tulis rows dalam satu transaksi. Kalau gagal karena error per baris,
+    bagi dua dan ulangi sampai baris yang bermasalah ketemu, sehingga
+    error tetap per baris dan baris lain di batch yang sama tetap masuk.
+    Error lain (koneksi, lock timeout) diteruskan ke pemanggil.
+    """
+    try:
+        write_rows(db, [row for _, row in rows])
+        db.commit()
+        return len(rows)
+    except ROW_LEVEL_ERRORS as e:
+        db.rollback()
+        if len(rows) == 1:
+            _add_error(report, rows[0][0], _db_error(e))
+            return 0
+
+    middle = len(rows) // 2
+    return (
+        _write_isolating_errors(db, rows[:middle], write_rows, report)
+        + _write_isolating_errors(db, rows[middle:], write_rows, report)
+    )
+
+
+def _run_import(
+    db: Session,
+    records: Iterable[tuple[int, dict | str]],
+    prepare_row: Callable[[dict], dict],
+    resolve_batch: ResolveBatch | None,
+    write_rows: WriteRows,
+    batch_size: int,
+    on_progress: ProgressCallback | None,
+) -> schemas.ImportReport:
+    report = schemas.ImportReport()
+    batch: list[tuple[int, dict]] = []
+
+    def flush():
+        try:
+            rows = resolve_batch(db, batch, report) if resolve_batch else list(batch)
+        except ROW_LEVEL_ERRORS as e:
+            db.rollback()
+            for line_no, _ in batch:
+                _add_error(report, line_no, _db_error(e))
+            rows = []
+
+        if rows:
+            report.rows_upserted += _write_isolating_errors(db, rows, write_rows, report)
+        if on_progress:
+            on_progress(report)
+        batch.clear()
+
+    try:
+        for line_no, record in records:
+            report.rows_read += 1
+            try:
+                batch.append((line_no, prepare_row(_as_dict(record))))
+            except RowError as e:
+                _add_error(report, line_no, str(e))
+                continue
+
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise ImportAborted(e, report) from e
+
+    return report
+
+
+# ==============================
+# Items (upsert by sku)
+# ==============================
+def _prepare_item(record: dict) -> dict:
+    row = {
+        "sku": _required(record, "sku"),
+        "name": _required(record, "name"),
+    }
+    for key in ("category", "uom"):
+        if _present(record, key):
+            row[key] = str(record[key]).strip()
+    for key in ("cost_price", "sell_price"):
+        if _present(record, key):
+            row[key] = _decimal(record, key)
+    if _present(record, "is_active"):
+        row["is_active"] = 1 if str(record["is_active"]).strip().lower() in ("1", "true", "yes") else 0
+    return row
+
+
+def _write_items(db: Session, rows: list[dict]):
+    now = datetime.utcnow()
+    _upsert(db, models.Item, [{**row, "updated_at": now} for row in rows], key_columns=("sku",))
+
+
+def import_items(
+    db: Session,
+    records: Iterable[tuple[int, dict | str]],
+    batch_size: int = BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> schemas.ImportReport:
+    return _run_import(db, records, _prepare_item, None, _write_items, batch_size, on_progress)
+
+
+# ==============================
+# RFID Tags (upsert by tag_uid)
+# ==============================
+def _prepare_rfid_tag(record: dict) -> dict:
+    row = {"tag_uid": _required(record, "tag_uid")}
+    _item_ref(record, row)
+    _location_ref(record, row, required=False)
+    if _present(record, "status"):
+        status = str(record["status"]).strip().upper()
+        if status not in RFID_STATUSES:
+            raise RowError(f"Invalid status: {record['status']!r}")
+        row["status"] = status
+    return row
+
+
+def _write_rfid_tags(db: Session, rows: list[dict]):
+    now = datetime.utcnow()
+    _upsert(db, models.RFIDTag, [{**row, "updated_at": now} for row in rows], key_columns=("tag_uid",))
+
+
+def import_rfid_tags(
+    db: Session,
+    records: Iterable[tuple[int, dict | str]],
+    batch_size: int = BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> schemas.ImportReport:
+    return _run_import(
+        db, records, _prepare_rfid_tag, _resolve_refs, _write_rfid_tags, batch_size, on_progress
+    )
+
+
+# ==============================
+# Item Locations (upsert by item_id + location_id)
+# ==============================
+def _prepare_item_location(record: dict) -> dict:
+    row = {}
+    _item_ref(record, row)
+    _location_ref(record, row, required=True)
+    if not _present(record, "system_qty"):
+        raise RowError("Missing required field 'system_qty'")
+    row["system_qty"] = _decimal(record, "system_qty")
+    return row
+
+
+def _write_item_locations(db: Session, rows: list[dict]):
+    _upsert(db, models.ItemLocation, rows, key_columns=("item_id", "location_id"))
+
+
+def import_item_locations(
+    db: Session,
+    records: Iterable[tuple[int, dict | str]],
+    batch_size: int = BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
+) -> schemas.ImportReport:
+    # tanpa unique key, ON DUPLICATE KEY tidak pernah kena dan setiap
+    # re-import menambah baris duplikat
+    if not migrations.has_item_location_unique_key(db.get_bind()):
+        raise ValueError(
+            "item_locations has no unique (item_id, location_id) key; "
+            "run `python -m app.cli init-db` first"
+        )
+
+    return _run_import(
+        db,
+        records,
+        _prepare_item_location,
+        _resolve_refs,
+        _write_item_locations,
+        batch_size,
+        on_progress,
+    )
+
+
+IMPORTERS = {
+    "items": import_items,
+    "rfid-tags": import_rfid_tags,
+    "item-locations": import_item_locations,
+}
+
+
+def log_progress(report: schemas.ImportReport):
+    logger.info(
+        "bulk import: %d rows read, %d upserted, %d errors",
+        report.rows_read,
+        report.rows_upserted,
+        report.error_count,
+    )
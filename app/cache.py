@@ -0,0 +1,152 @@
+"""
+Conditional GET (ETag / Last-Modified) dan TTL cache kecil untuk
+response JSON yang sudah di-serialize.
+
+Validator dihitung dari kolom-kolom kecil (updated_at dkk) sehingga
+request yang tidak berubah bisa dijawab 304 tanpa serialize apa-apa.
+Cache bersifat per-process; ETag tetap benar antar worker karena
+dihitung dari database, cache hanya menghemat serialize ulang.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Hashable
+
+from fastapi import Request, Response
+
+from .database import settings
+
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: bytes):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, prefix: tuple):
+        with self._lock:
+            for key in [k for k in self._data if k[: len(prefix)] == prefix]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+response_cache = TTLCache(
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
+
+
+# ==============================
+# Invalidation (dipanggil dari crud setelah write)
+# ==============================
+def invalidate_session(session_id: int, location_id: int | None = None):
+    response_cache.invalidate(("session", session_id))
+    if location_id is None:
+        response_cache.invalidate(("sessions",))
+    else:
+        response_cache.invalidate(("sessions", location_id))
+        response_cache.invalidate(("sessions", None))
+
+
+# ==============================
+# Validators
+# ==============================
+def make_etag(*parts: Hashable) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _settled(last_modified: datetime) -> bool:
+    """
+    updated_at hanya presisi detik: write lain di detik yang sama tidak
+    mengubah Last-Modified. Last-Modified hanya dikirim (dan
+    If-Modified-Since hanya dihormati) kalau detik tsb sudah lewat, dengan
+    margin satu detik karena MySQL membulatkan pecahan detik ke atas;
+    sebelum itu client memakai ETag.
+    """
+    current_second = datetime.utcnow().replace(microsecond=0)
+    return last_modified < current_second - timedelta(seconds=1)
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match lebih diutamakan daripada If-Modified-Since (RFC 9110)
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        return modified <= since
+
+    return False
+
+
+def cached_json_response(
+    request: Request,
+    key: tuple,
+    etag: str,
+    last_modified: datetime | None,
+    build: Callable[[], bytes],
+) -> Response:
+    """
+    304 kalau client sudah punya versi ini, selain itu body dari cache
+    (atau build() sekali lalu disimpan).
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None and not _settled(last_modified):
+        last_modified = None
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    cache_key = key + (etag,)
+    body = response_cache.get(cache_key)
+    if body is None:
+        body = build()
+        response_cache.set(cache_key, body)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,146 @@
+"""
+Command line entry point, dijalankan dengan `python -m app.cli <command>`.
+
+    python -m app.cli init-db
+    python -m app.cli init-db --dedupe-item-locations
+    python -m app.cli import items items.csv
+    python -m app.cli import rfid-tags tags.ndjson --batch-size 10000
+    python -m app.cli archive
+    python -m app.cli rollup --from 2024-01-01 --to 2024-03-31
+"""
+import argparse
+import sys
+from datetime import date
+
+from .database import SessionLocal, engine, Base
+from . import archive, bulk_import, migrations, models, rollups  # noqa: F401 (register tables on Base)
+
+
+def _print_progress(report):
+    print(
+        f"\r{report.rows_read} rows read, {report.rows_upserted} upserted, "
+        f"{report.error_count} errors",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def cmd_init_db(args) -> int:
+    # create table yang belum ada (sekali per deploy, bukan per worker),
+    # lalu migrasi constraint untuk tabel yang sudah ada
+    Base.metadata.create_all(bind=engine)
+    try:
+        messages = migrations.run_all(
+            engine, dedupe_item_locations=args.dedupe_item_locations
+        )
+    except migrations.MigrationError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for message in messages:
+        print(message, file=sys.stderr)
+    print(f"Schema ready: {len(Base.metadata.tables)} tables", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args) -> int:
+    importer = bulk_import.IMPORTERS[args.table]
+    fmt = args.format or bulk_import.detect_format(args.path)
+
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = importer(
+                db,
+                bulk_import.iter_records(stream, fmt),
+                batch_size=args.batch_size,
+                on_progress=_print_progress,
+            )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except bulk_import.ImportAborted as e:
+        print(file=sys.stderr)
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+
+    print(file=sys.stderr)
+    for err in report.errors:
+        print(f"line {err.line}: {err.error}", file=sys.stderr)
+    if report.error_count > len(report.errors):
+        print(f"... {report.error_count - len(report.errors)} more errors", file=sys.stderr)
+
+    return 1 if report.error_count else 0
+
+
+def cmd_archive(args) -> int:
+    def progress(label, moved):
+        print(f"\r{label}: {moved} rows archived", end="", file=sys.stderr, flush=True)
+
+    db = SessionLocal()
+    try:
+        if not args.movements_only:
+            archive.archive_closed_session_scans(db, args.chunk_size, progress)
+            print(file=sys.stderr)
+        if not args.scans_only:
+            print(f"movement cutoff: {archive.movement_archive_cutoff(db)}", file=sys.stderr)
+            archive.archive_old_movements(db, args.chunk_size, progress)
+            print(file=sys.stderr)
+    finally:
+        db.close()
+    return 0
+
+
+def cmd_rollup(args) -> int:
+    if args.date_from > args.date_to:
+        print("--from must be before --to", file=sys.stderr)
+        return 2
+
+    db = SessionLocal()
+    try:
+        rows = rollups.rebuild_daily_rollups(db, args.date_from, args.date_to)
+    finally:
+        db.close()
+    print(f"{rows} daily rollup rows rebuilt", file=sys.stderr)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_init = sub.add_parser("init-db", help="Create missing tables")
+    p_init.add_argument(
+        "--dedupe-item-locations",
+        action="store_true",
+        help="Delete duplicate item_locations rows (backed up first) before adding the unique key",
+    )
+    p_init.set_defaults(func=cmd_init_db)
+
+    p_import = sub.add_parser("import", help="Bulk upsert items / rfid tags / item locations")
+    p_import.add_argument("table", choices=sorted(bulk_import.IMPORTERS))
+    p_import.add_argument("path", help="CSV or NDJSON file")
+    p_import.add_argument("--format", choices=["csv", "ndjson"])
+    p_import.add_argument("--batch-size", type=int, default=bulk_import.BATCH_SIZE)
+    p_import.set_defaults(func=cmd_import)
+
+    p_archive = sub.add_parser("archive", help="Move closed-session scans and old movements to archive tables")
+    p_archive.add_argument("--chunk-size", type=int, default=archive.ARCHIVE_CHUNK_SIZE)
+    only = p_archive.add_mutually_exclusive_group()
+    only.add_argument("--scans-only", action="store_true")
+    only.add_argument("--movements-only", action="store_true")
+    p_archive.set_defaults(func=cmd_archive)
+
+    p_rollup = sub.add_parser("rollup", help="Rebuild daily movement rollups for a date range")
+    p_rollup.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True)
+    p_rollup.add_argument("--to", dest="date_to", type=date.fromisoformat, required=True)
+    p_rollup.set_defaults(func=cmd_rollup)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, cast, and_, delete, exists, insert, literal, select, Integer
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from . import models, schemas
+from . import models, schemas, cache, rollups
+from .database import settings
 
 
 # ==============================
@@ -51,37 +53,275 @@ def create_opname_session(db: Session, payload: schemas.SessionCreate, user_id:
         total_items=total_items,
         items_scanned=0,
         created_by=user_id,
+        updated_at=now,
     )
     db.add(session)
     db.commit()
     db.refresh(session)
 
     # Snapshot: Save system qty into stock_opname_items
-    item_locations = (
-        db.query(models.ItemLocation)
-        .filter(models.ItemLocation.location_id == payload.location_id)
+    snapshot_session_items(db, [session.id])
+
+    db.commit()
+    cache.invalidate_session(session.id, session.location_id)
+    return session
+
+
+# ==============================
+# Snapshot Items (set-based)
+# ==============================
+def snapshot_session_items(db: Session, session_ids: list[int]) -> int:
+    """
+    INSERT ... SELECT system_qty dari item_locations ke stock_opname_items
+    untuk semua sesi di session_ids sekaligus (tanpa load ke Python).
+    """
+    S = models.StockOpnameSession
+    IL = models.ItemLocation
+    system_qty = func.coalesce(IL.system_qty, 0)
+
+    snapshot = (
+        select(
+            S.id,
+            IL.item_id,
+            system_qty,
+            literal(0),
+            system_qty,
+            literal(0),
+            literal(0),
+            literal(0),
+            literal("OK"),
+        )
+        .join(IL, IL.location_id == S.location_id)
+        .where(S.id.in_(session_ids))
+    )
+
+    result = db.execute(
+        insert(models.StockOpnameItem).from_select(
+            [
+                "session_id",
+                "item_id",
+                "system_qty",
+                "movement_qty",
+                "effective_qty",
+                "counted_qty",
+                "variance_qty",
+                "variance_value",
+                "status",
+            ],
+            snapshot,
+        )
+    )
+    return result.rowcount
+
+
+# ==============================
+# Create Sessions for Many Locations
+# ==============================
+def resolve_batch_locations(db: Session, payload: schemas.SessionBatchCreate):
+    q = db.query(models.Location)
+
+    if payload.location_ids:
+        q = q.filter(models.Location.id.in_(payload.location_ids))
+    elif payload.location_type:
+        q = q.filter(models.Location.type == payload.location_type)
+    else:
+        raise ValueError("Either location_ids or location_type is required")
+
+    locations = q.order_by(models.Location.id).all()
+    if not locations:
+        raise ValueError("No locations found")
+
+    if payload.location_ids:
+        missing = set(payload.location_ids) - {loc.id for loc in locations}
+        if missing:
+            raise ValueError(f"Location not found: {sorted(missing)}")
+
+    return locations
+
+
+def generate_session_codes(db: Session, location_codes: list[str]) -> dict[str, str]:
+    """
+    Sama dengan generate_session_code, tapi untuk banyak lokasi dengan
+    satu query.
+    """
+    today = datetime.today().strftime("%Y%m%d")
+
+    existing: dict[str, int] = {}
+    for (code,) in (
+        db.query(models.StockOpnameSession.code)
+        .filter(models.StockOpnameSession.code.like(f"SO-%-{today}-%"))
+        .all()
+    ):
+        prefix = code.rsplit("-", 1)[0]
+        existing[prefix] = existing.get(prefix, 0) + 1
+
+    codes = {}
+    for location_code in location_codes:
+        prefix = f"SO-{location_code}-{today}"
+        codes[location_code] = f"{prefix}-{existing.get(prefix, 0) + 1:03d}"
+
+    return codes
+
+
+def create_opname_sessions_batch(
+    db: Session,
+    payload: schemas.SessionBatchCreate,
+    user_id: int | None = None,
+) -> tuple[datetime, list[dict]]:
+    """
+    Buat sesi PLANNED untuk banyak lokasi dengan satu snapshot_at yang sama.
+    Return (snapshot_at, [{id, code, location_id, total_items}, ...]).
+    Item belum di-snapshot; jalankan snapshot_sessions_parallel setelahnya.
+    """
+    locations = resolve_batch_locations(db, payload)
+    location_ids = [loc.id for loc in locations]
+
+    now = datetime.utcnow()
+    codes = generate_session_codes(db, [loc.code for loc in locations])
+
+    total_items = dict(
+        db.query(models.ItemLocation.location_id, func.count(models.ItemLocation.id))
+        .filter(models.ItemLocation.location_id.in_(location_ids))
+        .group_by(models.ItemLocation.location_id)
         .all()
     )
 
-    for il in item_locations:
-        system_qty = float(il.system_qty or 0)
+    S = models.StockOpnameSession
+    rows = [
+        {
+            "code": codes[loc.code],
+            "location_id": loc.id,
+            "snapshot_at": now,
+            "type": payload.type,
+            "status": "PLANNED",
+            "scheduled_start_at": payload.scheduled_start_at,
+            "scheduled_end_at": payload.scheduled_end_at,
+            "notes": payload.notes,
+            "total_items": total_items.get(loc.id, 0),
+            "items_scanned": 0,
+            "created_by": user_id,
+            "updated_at": now,
+        }
+        for loc in locations
+    ]
+    # satu INSERT multi-row lalu satu SELECT untuk id-nya (code unik),
+    # bukan INSERT + reload per lokasi
+    db.execute(insert(S), rows)
+    created = [
+        {
+            "id": r.id,
+            "code": r.code,
+            "location_id": r.location_id,
+            "total_items": r.total_items,
+        }
+        for r in db.query(S.id, S.code, S.location_id, S.total_items)
+        .filter(S.code.in_([row["code"] for row in rows]))
+        .order_by(S.location_id)
+        .all()
+    ]
+    db.commit()
 
-        db.add(
-            models.StockOpnameItem(
-                session_id=session.id,
-                item_id=il.item_id,
-                system_qty=system_qty,
-                movement_qty=0,
-                effective_qty=system_qty,
-                counted_qty=0,
-                variance_qty=0,
-                variance_value=0,
-                status="OK",
+    for session in created:
+        cache.invalidate_session(session["id"], session["location_id"])
+
+    return now, created
+
+
+def _snapshot_chunk(bind, session_ids: list[int]) -> int:
+    with Session(bind=bind) as db:
+        inserted = snapshot_session_items(db, session_ids)
+        db.commit()
+        return inserted
+
+
+def _discard_unsnapshotted_sessions(bind, session_ids: list[int]) -> list[dict]:
+    """
+    Hapus sesi PLANNED yang belum punya item (chunk snapshot-nya gagal),
+    supaya tidak tertinggal sesi kosong. Return [{id, location_id}, ...]
+    yang dihapus; lokasinya bisa dikirim ulang ke POST /batch.
+    """
+    S = models.StockOpnameSession
+    with Session(bind=bind) as db:
+        empty = (
+            db.query(S.id, S.location_id)
+            .filter(
+                S.id.in_(session_ids),
+                S.status == "PLANNED",
+                ~exists().where(models.StockOpnameItem.session_id == S.id),
             )
+            .all()
         )
+        removed = [{"id": r.id, "location_id": r.location_id} for r in empty]
+        if removed:
+            db.execute(delete(S).where(S.id.in_([r["id"] for r in removed])))
+            db.commit()
+
+    for session in removed:
+        cache.invalidate_session(session["id"], session["location_id"])
+    return removed
 
-    db.commit()
-    return session
+
+def snapshot_sessions_parallel(
+    bind,
+    session_ids: list[int],
+    chunk_size: int | None = None,
+    workers: int | None = None,
+):
+    """
+    Snapshot item untuk banyak sesi, dibagi per chunk dan dijalankan
+    paralel (masing-masing dengan koneksi sendiri). Yield event progress.
+
+    Sesi dari chunk yang gagal dihapus lagi di akhir; event "done" berisi
+    failed_location_ids untuk diulang.
+    """
+    chunk_size = chunk_size or settings.BATCH_SNAPSHOT_CHUNK_SIZE
+    workers = workers or settings.BATCH_SNAPSHOT_WORKERS
+    chunks = [session_ids[i:i + chunk_size] for i in range(0, len(session_ids), chunk_size)]
+
+    done = 0
+    items_inserted = 0
+    failed: list[int] = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_snapshot_chunk, bind, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            done += len(chunk)
+            try:
+                items_inserted += future.result()
+            except Exception as e:
+                failed.extend(chunk)
+                yield {
+                    "event": "error",
+                    "session_ids": chunk,
+                    "error": str(getattr(e, "orig", None) or e)[:500],
+                }
+            yield {
+                "event": "progress",
+                "sessions_done": done,
+                "sessions_total": len(session_ids),
+                "items_inserted": items_inserted,
+            }
+
+    removed: list[dict] = []
+    if failed:
+        try:
+            removed = _discard_unsnapshotted_sessions(bind, failed)
+        except Exception as e:
+            yield {
+                "event": "error",
+                "session_ids": sorted(failed),
+                "error": "cleanup failed: " + str(getattr(e, "orig", None) or e)[:500],
+            }
+
+    yield {
+        "event": "done",
+        "sessions_total": len(session_ids),
+        "items_inserted": items_inserted,
+        "failed_session_ids": sorted(failed),
+        "removed_session_ids": sorted(r["id"] for r in removed),
+        "failed_location_ids": sorted(r["location_id"] for r in removed),
+    }
 
 
 # ==============================
@@ -94,7 +334,9 @@ def start_session(db: Session, session_id: int):
 
     session.status = "IN_PROGRESS"
     session.started_at = datetime.utcnow()
+    session.updated_at = session.started_at
     db.commit()
+    cache.invalidate_session(session.id, session.location_id)
     db.refresh(session)
     return session
 
@@ -122,6 +364,51 @@ def list_sessions(db: Session, location_id: int | None = None):
     return q.order_by(models.StockOpnameSession.created_at.desc()).all()
 
 
+# ==============================
+# Session Versions (untuk ETag / Last-Modified)
+# ==============================
+def get_session_version(db: Session, session_id: int):
+    """
+    Kolom kecil yang menentukan isi SessionResponse, tanpa load objek penuh.
+    """
+    S = models.StockOpnameSession
+    return (
+        db.query(
+            func.coalesce(S.updated_at, S.created_at).label("modified_at"),
+            S.status,
+            S.total_items,
+            S.items_scanned,
+            S.progress_percent,
+        )
+        .filter(S.id == session_id)
+        .first()
+    )
+
+
+SESSION_STATUS_RANK = {"PLANNED": 1, "IN_PROGRESS": 2, "REVIEW": 3, "CLOSED": 4}
+
+
+def get_sessions_version(db: Session, location_id: int | None = None):
+    """
+    updated_at hanya presisi detik, jadi max(updated_at) saja tidak cukup:
+    perubahan status sesi mana pun selalu mengubah sum(id * rank status).
+    """
+    S = models.StockOpnameSession
+    status_rank = case(SESSION_STATUS_RANK, value=S.status, else_=0)
+    q = db.query(
+        func.count(S.id).label("count"),
+        func.max(func.coalesce(S.updated_at, S.created_at)).label("modified_at"),
+        func.coalesce(func.sum(S.items_scanned), 0).label("items_scanned"),
+        func.coalesce(func.sum(S.progress_percent), 0).label("progress_percent"),
+        func.coalesce(func.sum(S.id * status_rank), 0).label("status_sum"),
+    ).join(models.Location)
+
+    if location_id:
+        q = q.filter(S.location_id == location_id)
+
+    return q.one()
+
+
 # ==============================
 # Compute Movement Qty
 # ==============================
@@ -182,6 +469,7 @@ def process_scan_batch(
     if not new_tags:
         session.updated_at = datetime.utcnow()
         db.commit()
+        cache.invalidate_session(session.id, session.location_id)
         return session
 
     # ================================
@@ -293,6 +581,7 @@ def process_scan_batch(
     session.updated_at = datetime.utcnow()
 
     db.commit()
+    cache.invalidate_session(session.id, session.location_id)
     db.refresh(session)
     return session
 
@@ -307,9 +596,12 @@ def create_inventory_movement(db: Session, payload: schemas.InventoryMovementCre
         qty_change=payload.qty_change,
         reason=payload.reason,
         reference_id=payload.reference_id,
+        created_at=datetime.utcnow(),
     )
 
     db.add(movement)
+    # rollup harian di transaksi yang sama
+    rollups.apply_movement(db, movement)
     db.commit()
     db.refresh(movement)
     return movement
@@ -404,4 +696,85 @@ def get_opname_items_with_item_and_rfid(
             }
         )
 
-    return result
\ No newline at end of file
+    return result
+
+
+# ==============================
+# Fast path untuk /items
+# ==============================
+def _int_qty(column):
+    # sama dengan int(Decimal(v)) di schema: NULL -> 0, dibulatkan ke arah nol
+    return cast(func.truncate(func.coalesce(column, 0), 0), Integer)
+
+
+def build_opname_item_dicts(rows, rfid_map: dict[int, list[str]]) -> list[dict]:
+    """
+    rows: tuple (item_id, sku, name, 6 qty int, status) dari
+    get_opname_items_fast; tanpa validasi pydantic per baris.
+    """
+    codes = rfid_map.get
+    return [
+        {
+            "item_id": r[0],
+            "sku": r[1],
+            "name": r[2],
+            "system_qty": r[3],
+            "movement_qty": r[4],
+            "effective_qty": r[5],
+            "counted_qty": r[6],
+            "variance_qty": r[7],
+            "variance_value": r[8],
+            "status": r[9],
+            "item_codes": codes(r[0], []),
+        }
+        for r in rows
+    ]
+
+
+def get_opname_items_fast(
+    db: Session,
+    session_id: int,
+    status: str | None = None,
+) -> list[dict]:
+    """
+    Sama dengan get_opname_items_with_item_and_rfid, tapi angka di-cast ke
+    integer di SQL sehingga hasilnya bisa langsung di-encode ke JSON.
+    """
+    OI = models.StockOpnameItem
+
+    q = (
+        db.query(
+            OI.item_id,
+            models.Item.sku,
+            models.Item.name,
+            _int_qty(OI.system_qty),
+            _int_qty(OI.movement_qty),
+            _int_qty(OI.effective_qty),
+            _int_qty(OI.counted_qty),
+            _int_qty(OI.variance_qty),
+            _int_qty(OI.variance_value),
+            OI.status,
+        )
+        .join(models.Item, models.Item.id == OI.item_id)
+        .filter(OI.session_id == session_id)
+    )
+
+    # RFID aktif untuk item di sesi ini, via EXISTS (bukan IN dengan ribuan
+    # id, dan tidak dobel kalau (session_id, item_id) muncul lebih dari sekali)
+    in_session = and_(OI.item_id == models.RFIDTag.item_id, OI.session_id == session_id)
+
+    if status:
+        q = q.filter(OI.status == status)
+        in_session = and_(in_session, OI.status == status)
+
+    rfid_q = (
+        db.query(models.RFIDTag.item_id, models.RFIDTag.tag_uid)
+        .filter(models.RFIDTag.status == "ACTIVE")
+        .filter(exists().where(in_session))
+    )
+
+    rfid_map: dict[int, list[str]] = {}
+    for item_id, tag_uid in rfid_q:
+        rfid_map.setdefault(item_id, []).append(tag_uid)
+
+    return build_opname_item_dicts(q.all(), rfid_map)
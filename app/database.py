@@ -1,4 +1,9 @@
+import threading
+import time
+
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, declarative_base
 from pydantic_settings import BaseSettings
 
@@ -9,6 +14,31 @@ class Settings(BaseSettings):
     DB_PORT: int = 3306
     DB_NAME: str = "stock_opname_rfid"
 
+    # optional read replica untuk endpoint GET (reporting)
+    DB_REPLICA_URL: str | None = None
+    # replica dipakai hanya kalau lag-nya <= batas ini (detik)
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+    # replica yang lambat / mati jangan sampai menahan request lama
+    DB_REPLICA_CONNECT_TIMEOUT: int = 2
+
+    # cache response JSON per worker (0 = nonaktif)
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
+    # profiling per request: header "X-Profile: 1" atau sampling (0..1)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "profiles"
+
+    # movement yang lebih tua dari ini (dan dari snapshot sesi yang masih
+    # terbuka) dipindah ke inventory_movements_archive
+    ARCHIVE_MOVEMENT_MIN_AGE_DAYS: int = 30
+
+    # batch create session: jumlah sesi per chunk snapshot dan thread paralel
+    BATCH_SNAPSHOT_CHUNK_SIZE: int = 20
+    BATCH_SNAPSHOT_WORKERS: int = 4
+
     class Config:
         env_file = ".env"
 
@@ -26,12 +56,108 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+replica_engine = (
+    create_engine(
+        settings.DB_REPLICA_URL,
+        pool_pre_ping=True,
+        connect_args={"connect_timeout": settings.DB_REPLICA_CONNECT_TIMEOUT},
+    )
+    if settings.DB_REPLICA_URL
+    else None
+)
+
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None
+    else None
+)
+
 Base = declarative_base()
 
+# cookie yang di-set setelah request tulis, supaya client tsb
+# membaca dari primary selama window lag (read-your-writes)
+LAST_WRITE_COOKIE = "so_last_write"
+
+_replica_lock = threading.Lock()
+_replica_state = {"checked_at": float("-inf"), "fresh": False, "probing": False}
+
+
+def _read_replica_lag(conn) -> float | None:
+    for statement in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+        try:
+            row = conn.exec_driver_sql(statement).mappings().first()
+        except SQLAlchemyError:
+            continue
+        if not row:
+            return None
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return float(lag) if lag is not None else None
+    return None
+
+
+def replica_is_fresh() -> bool:
+    """
+    Cek lag replica, hasilnya di-cache selama DB_REPLICA_LAG_CHECK_INTERVAL.
+    Lag yang tidak diketahui (replikasi berhenti / error) dianggap tidak fresh.
+
+    Probe dijalankan di luar lock oleh satu request saja; request lain
+    memakai hasil terakhir selama probe berjalan (awalnya: tidak fresh,
+    jadi ke primary).
+    """
+    if replica_engine is None:
+        return False
+
+    with _replica_lock:
+        due = time.monotonic() - _replica_state["checked_at"] >= settings.DB_REPLICA_LAG_CHECK_INTERVAL
+        if not due or _replica_state["probing"]:
+            return _replica_state["fresh"]
+        _replica_state["probing"] = True
+
+    lag = None
+    try:
+        with replica_engine.connect() as conn:
+            lag = _read_replica_lag(conn)
+    except SQLAlchemyError:
+        pass
+    finally:
+        fresh = lag is not None and lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        with _replica_lock:
+            _replica_state["fresh"] = fresh
+            _replica_state["checked_at"] = time.monotonic()
+            _replica_state["probing"] = False
+
+    return fresh
+
+
+def has_recent_write(request: Request) -> bool:
+    value = request.cookies.get(LAST_WRITE_COOKIE)
+    if not value:
+        return False
+    try:
+        return time.time() - float(value) <= settings.DB_REPLICA_MAX_LAG_SECONDS
+    except ValueError:
+        return False
+
+
 # Dependency untuk FastAPI
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dependency untuk endpoint baca: replica kalau tersedia dan cukup fresh,
+# selain itu (atau kalau client baru saja menulis) tetap ke primary
+def get_read_db(request: Request):
+    use_replica = (
+        ReplicaSessionLocal is not None
+        and not has_recent_write(request)
+        and replica_is_fresh()
+    )
+    db = ReplicaSessionLocal() if use_replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
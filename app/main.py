@@ -1,11 +1,14 @@
-from fastapi import FastAPI
-from .database import engine, Base
-from .routers import stock_opname, inventory_movements
-from fastapi.middleware.cors import CORSMiddleware
+import time
 
+from fastapi import FastAPI, Request
+from .database import settings, LAST_WRITE_COOKIE
+from .routers import stock_opname, inventory_movements, imports
+from . import profiling
+from fastapi.middleware.cors import CORSMiddleware
 
-# untuk dev: auto create table jika belum ada
-Base.metadata.create_all(bind=engine)
+# Schema TIDAK dibuat saat import (supaya tiap worker tidak connect ke DB
+# sebelum bisa menerima traffic). Jalankan sekali per deploy:
+#   python -m app.cli init-db
 
 app = FastAPI(
     title="Smart Stock Opname RFID API",
@@ -25,8 +28,33 @@ app.add_middleware(
 )
 
 
+# =========================
+# READ-YOUR-WRITES
+# =========================
+# setelah request tulis berhasil, client ditandai supaya GET berikutnya
+# selama window lag replica tetap dibaca dari primary
+@app.middleware("http")
+async def mark_recent_write(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            str(time.time()),
+            max_age=int(settings.DB_REPLICA_MAX_LAG_SECONDS) + 1,
+            httponly=True,
+        )
+    return response
+
+
+# =========================
+# PROFILING (opt-in, lihat app/profiling.py)
+# =========================
+app.middleware("http")(profiling.profiling_middleware)
+
+
 app.include_router(stock_opname.router)
 app.include_router(inventory_movements.router)
+app.include_router(imports.router)
 
 
 @app.get("/")
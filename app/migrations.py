@@ -0,0 +1,124 @@
+"""
+Perubahan schema untuk tabel yang sudah ada. create_all hanya membuat
+tabel baru dan tidak pernah mengubah tabel existing, jadi constraint yang
+ditambahkan belakangan dipasang di sini oleh `python -m app.cli init-db`.
+"""
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+ITEM_LOCATION_UNIQUE_KEY = "uq_item_locations_item_location"
+ITEM_LOCATION_KEY_COLUMNS = {"item_id", "location_id"}
+
+
+def has_item_location_unique_key(bind) -> bool:
+    """
+    True kalau item_locations punya unique key (item_id, location_id),
+    yang dibutuhkan upsert bulk import item-locations.
+    """
+    insp = inspect(bind)
+    for constraint in insp.get_unique_constraints("item_locations"):
+        if set(constraint["column_names"]) == ITEM_LOCATION_KEY_COLUMNS:
+            return True
+    for index in insp.get_indexes("item_locations"):
+        if index.get("unique") and set(index["column_names"]) == ITEM_LOCATION_KEY_COLUMNS:
+            return True
+    return False
+
+
+class MigrationError(ValueError):
+    pass
+
+
+def find_item_location_duplicates(bind, limit: int = 20):
+    """
+    Return (jumlah pasangan duplikat, contoh [(item_id, location_id, n), ...]).
+    """
+    duplicates = (
+        "SELECT item_id, location_id, COUNT(*) AS n FROM item_locations "
+        "GROUP BY item_id, location_id HAVING COUNT(*) > 1"
+    )
+    with bind.connect() as conn:
+        total = conn.execute(text(f"SELECT COUNT(*) FROM ({duplicates}) d")).scalar()
+        sample = conn.execute(
+            text(f"{duplicates} ORDER BY item_id, location_id LIMIT :limit"),
+            {"limit": limit},
+        ).all()
+    return total, [tuple(row) for row in sample]
+
+
+def ensure_item_location_unique_key(engine: Engine, dedupe: bool = False) -> str | None:
+    """
+    Tambahkan unique key (item_id, location_id). Kalau masih ada baris
+    duplikat, berhenti dengan MigrationError kecuali dedupe=True: baris
+    lama disalin ke tabel backup lalu dihapus, yang id-nya paling besar
+    (import terakhir) dipertahankan.
+    Return pesan ringkas, atau None kalau key sudah ada.
+    """
+    if has_item_location_unique_key(engine):
+        return None
+
+    total, sample = find_item_location_duplicates(engine)
+    if total and not dedupe:
+        lines = [f"  item_id={i} location_id={loc}: {n} rows" for i, loc, n in sample]
+        if total > len(sample):
+            lines.append(f"  ... {total - len(sample)} more pairs")
+        raise MigrationError(
+            f"item_locations has {total} duplicate (item_id, location_id) pairs; "
+            f"unique key {ITEM_LOCATION_UNIQUE_KEY} not added:\n"
+            + "\n".join(lines)
+            + "\nfix them manually or rerun with --dedupe-item-locations "
+            "(keeps the row with the highest id)"
+        )
+
+    removed, backup = 0, None
+    if total:
+        backup = f"item_locations_dupes_{datetime.utcnow():%Y%m%d%H%M%S}"
+        older = (
+            "FROM item_locations il WHERE EXISTS ("
+            "SELECT 1 FROM item_locations newer "
+            "WHERE newer.item_id = il.item_id "
+            "AND newer.location_id = il.location_id "
+            "AND newer.id > il.id)"
+        )
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE {backup} AS SELECT il.* {older}"))
+        with engine.begin() as conn:
+            removed = conn.execute(
+                text(
+                    "DELETE il FROM item_locations il "
+                    "JOIN item_locations newer "
+                    "ON newer.item_id = il.item_id "
+                    "AND newer.location_id = il.location_id "
+                    "AND newer.id > il.id"
+                )
+            ).rowcount
+
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"ALTER TABLE item_locations ADD CONSTRAINT {ITEM_LOCATION_UNIQUE_KEY} "
+                "UNIQUE (item_id, location_id)"
+            )
+        )
+
+    if backup:
+        return (
+            f"item_locations: removed {removed} duplicate rows (copied to {backup}), "
+            f"added unique key {ITEM_LOCATION_UNIQUE_KEY}"
+        )
+    return f"item_locations: added unique key {ITEM_LOCATION_UNIQUE_KEY}"
+
+
+def run_all(engine: Engine, dedupe_item_locations: bool = False) -> list[str]:
+    """
+    Raise MigrationError kalau migrasi butuh keputusan manual.
+    """
+    messages = []
+
+    message = ensure_item_location_unique_key(engine, dedupe=dedupe_item_locations)
+    if message:
+        messages.append(message)
+
+    return messages
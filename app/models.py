@@ -4,10 +4,13 @@ from sqlalchemy import (
     String,
     Enum,
     DateTime,
+    Date,
     Text,
     Integer,
     Numeric,
     ForeignKey,
+    UniqueConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -53,6 +56,10 @@ class Item(Base):
 
 class ItemLocation(Base):
     __tablename__ = "item_locations"
+    # satu baris stok per item per lokasi (dipakai juga untuk upsert bulk import)
+    __table_args__ = (
+        UniqueConstraint("item_id", "location_id", name="uq_item_locations_item_location"),
+    )
 
     id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
     item_id = Column(BigInteger, ForeignKey("items.id"), nullable=False)
@@ -173,4 +180,105 @@ class InventoryMovement(Base):
 
     # optional relationships
     # item = relationship("Item")
-    # location = relationship("Location")
\ No newline at end of file
+    # location = relationship("Location")
+
+
+# ==============================
+# Rollup tables
+# ==============================
+# Ringkasan inventory_movements per item/lokasi/hari/reason, di-update
+# incremental oleh create_inventory_movement (lihat app/rollups.py).
+class InventoryMovementDaily(Base):
+    __tablename__ = "inventory_movement_daily"
+    __table_args__ = (
+        UniqueConstraint(
+            "location_id",
+            "day",
+            "item_id",
+            "reason",
+            name="uq_inventory_movement_daily",
+        ),
+        Index("ix_inventory_movement_daily_item_day", "item_id", "day"),
+    )
+
+    id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    location_id = Column(BigInteger, ForeignKey("locations.id"), nullable=False)
+    item_id = Column(BigInteger, ForeignKey("items.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    reason = Column(
+        Enum(
+            "SALE",
+            "RESTOCK",
+            "TRANSFER_IN",
+            "TRANSFER_OUT",
+            "RETURN",
+            "ADJUSTMENT",
+            "CANCELLED",
+            "OTHER",
+            name="movement_reason",
+        ),
+        nullable=False,
+    )
+    qty_in = Column(Numeric(15, 3), nullable=False, default=0)
+    qty_out = Column(Numeric(15, 3), nullable=False, default=0)
+    net_qty = Column(Numeric(15, 3), nullable=False, default=0)
+    movement_count = Column(Integer, nullable=False, default=0)
+
+
+# ==============================
+# Archive tables
+# ==============================
+# Salinan kompak dari stock_opname_scans / inventory_movements (id sama,
+# tanpa foreign key) untuk data yang sudah tidak dipakai sesi yang masih
+# berjalan. Lihat app/archive.py.
+class StockOpnameScanArchive(Base):
+    __tablename__ = "stock_opname_scans_archive"
+    __table_args__ = (
+        Index("ix_stock_opname_scans_archive_session_id", "session_id"),
+        {"mysql_row_format": "COMPRESSED"},
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    session_id = Column(BigInteger, nullable=False)
+    tag_uid = Column(String(64), nullable=False)
+    item_id = Column(BigInteger)
+    zone = Column(String(100))
+    scanned_at = Column(DateTime)
+    scanned_by = Column(BigInteger)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class InventoryMovementArchive(Base):
+    __tablename__ = "inventory_movements_archive"
+    __table_args__ = (
+        Index(
+            "ix_inventory_movements_archive_location_item_created",
+            "location_id",
+            "item_id",
+            "created_at",
+        ),
+        {"mysql_row_format": "COMPRESSED"},
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False)
+    item_id = Column(BigInteger, nullable=False)
+    location_id = Column(BigInteger, nullable=False)
+    qty_change = Column(Numeric(15, 3), nullable=False)
+    reason = Column(
+        Enum(
+            "SALE",
+            "RESTOCK",
+            "TRANSFER_IN",
+            "TRANSFER_OUT",
+            "RETURN",
+            "ADJUSTMENT",
+            "CANCELLED",
+            "OTHER",
+            name="movement_reason",
+        ),
+        nullable=False,
+    )
+    reference_id = Column(String(100))
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,210 @@
+"""
+Profiling per request (opt-in) untuk diagnosa hot path di production.
+
+Aktif kalau PROFILING_ENABLED=true dan request membawa header
+`X-Profile: 1` atau terpilih oleh PROFILING_SAMPLE_RATE. Untuk request
+tsb ditulis ke PROFILING_DIR:
+
+- <id>.prof  : cProfile dari endpoint (buka dengan snakeviz / pstats),
+               hanya kalau tidak ada request lain yang sedang di-profile
+- <id>.txt   : ringkasan fungsi teratas (cumulative)
+- <id>.json  : timeline SQL (offset, durasi, statement) + total waktu
+
+<id> dikembalikan di header response `X-Profile-Id`.
+"""
+import cProfile
+import contextlib
+import functools
+import inspect
+import io
+import json
+import logging
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from .database import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_current: ContextVar["RequestProfile | None"] = ContextVar("request_profile", default=None)
+
+# Python >= 3.12: cProfile memakai sys.monitoring yang berlaku untuk seluruh
+# interpreter, jadi hanya satu profiler yang boleh aktif sekaligus
+_cpu_profile_lock = threading.Lock()
+
+
+class RequestProfile:
+    def __init__(self, method: str, path: str):
+        self.id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.profiler = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.queries: list[dict] = []
+        self.cpu_profiled = False
+
+    def offset_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def write(self, status_code: int) -> Path:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        total_ms = self.offset_ms()
+
+        if self.cpu_profiled:
+            self.profiler.dump_stats(directory / f"{self.id}.prof")
+
+            summary = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=summary)
+            stats.sort_stats("cumulative").print_stats(40)
+            (directory / f"{self.id}.txt").write_text(summary.getvalue())
+
+        timeline = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": status_code,
+            "total_ms": round(total_ms, 3),
+            "cpu_profiled": self.cpu_profiled,
+            "sql_count": len(self.queries),
+            "sql_ms": round(sum(q["duration_ms"] for q in self.queries), 3),
+            "sql": self.queries,
+        }
+        path = directory / f"{self.id}.json"
+        path.write_text(json.dumps(timeline, indent=2))
+        return path
+
+
+# ==============================
+# SQL timeline
+# ==============================
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is not None:
+        conn.info.setdefault("profile_query_start", []).append(profile.offset_ms())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is None:
+        return
+    starts = conn.info.get("profile_query_start")
+    if not starts:
+        return
+    start_ms = starts.pop()
+    profile.queries.append(
+        {
+            "offset_ms": round(start_ms, 3),
+            "duration_ms": round(profile.offset_ms() - start_ms, 3),
+            "statement": statement,
+            "executemany": executemany,
+            "rowcount": cursor.rowcount,
+        }
+    )
+
+
+# ==============================
+# CPU profile around the endpoint
+# ==============================
+@contextlib.contextmanager
+def _cpu_profile(profile: "RequestProfile | None"):
+    """
+    Nyalakan cProfile untuk endpoint kalau tidak ada profiler lain yang
+    aktif. Kalau sedang dipakai request lain, CPU profile dilewati (timeline
+    SQL tetap direkam); request tidak pernah gagal karena profiling.
+
+    Python < 3.12 hanya merekam thread ini. Python >= 3.12 merekam semua
+    thread, sehingga .prof bisa ikut berisi request lain yang berjalan
+    bersamaan.
+    """
+    if profile is None or not _cpu_profile_lock.acquire(blocking=False):
+        yield
+        return
+
+    try:
+        try:
+            profile.profiler.enable()
+            profile.cpu_profiled = True
+        except ValueError:
+            # profiler lain (mis. debugger / APM) sudah aktif
+            logger.warning("cpu profile skipped for %s: another profiler is active", profile.id)
+
+        try:
+            yield
+        finally:
+            if profile.cpu_profiled:
+                profile.profiler.disable()
+    finally:
+        _cpu_profile_lock.release()
+
+
+def _profiled(endpoint):
+    # endpoint sync dijalankan di threadpool, jadi profiler dinyalakan di
+    # dalam endpoint itu sendiri (bukan di middleware)
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            with _cpu_profile(_current.get()):
+                return await endpoint(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with _cpu_profile(_current.get()):
+            return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+# ==============================
+# Middleware
+# ==============================
+def should_profile(request: Request) -> bool:
+    if not settings.PROFILING_ENABLED:
+        return False
+    if request.headers.get(PROFILE_HEADER) == "1":
+        return True
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+async def profiling_middleware(request: Request, call_next):
+    if not should_profile(request):
+        return await call_next(request)
+
+    profile = RequestProfile(request.method, request.url.path)
+    token = _current.set(profile)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    try:
+        path = await run_in_threadpool(profile.write, response.status_code)
+        logger.info("request profile written to %s", path)
+        response.headers[PROFILE_ID_HEADER] = profile.id
+    except OSError:
+        logger.exception("failed to write request profile %s", profile.id)
+    return response
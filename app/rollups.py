@@ -0,0 +1,160 @@
+"""
+Rollup harian inventory_movements per (lokasi, hari, item, reason).
+
+- apply_movement: update incremental, dipanggil di transaksi yang sama
+  dengan insert movement (create_inventory_movement)
+- rebuild_daily_rollups: hitung ulang satu rentang tanggal dari raw
+  movements (hot + archive), untuk backfill / koreksi:
+  `python -m app.cli rollup --from 2024-01-01 --to 2024-03-31`
+- query_daily / query_summary: read path untuk endpoint history
+"""
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import case, delete, func, insert, select, union_all
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from . import models
+
+Daily = models.InventoryMovementDaily
+
+
+# ==============================
+# Incremental update
+# ==============================
+def apply_movement(db: Session, movement: models.InventoryMovement):
+    qty = movement.qty_change
+    stmt = mysql_insert(Daily).values(
+        location_id=movement.location_id,
+        item_id=movement.item_id,
+        day=movement.created_at.date(),
+        reason=movement.reason,
+        qty_in=qty if qty > 0 else 0,
+        qty_out=-qty if qty < 0 else 0,
+        net_qty=qty,
+        movement_count=1,
+    )
+    stmt = stmt.on_duplicate_key_update(
+        qty_in=Daily.qty_in + stmt.inserted.qty_in,
+        qty_out=Daily.qty_out + stmt.inserted.qty_out,
+        net_qty=Daily.net_qty + stmt.inserted.net_qty,
+        movement_count=Daily.movement_count + 1,
+    )
+    db.execute(stmt)
+
+
+# ==============================
+# Batch rebuild
+# ==============================
+def rebuild_daily_rollups(db: Session, date_from: date, date_to: date) -> int:
+    """
+    Hapus lalu hitung ulang rollup untuk date_from..date_to (inklusif)
+    dari inventory_movements dan inventory_movements_archive. Jalankan
+    untuk hari yang sudah lewat; movement yang masuk selama rebuild di
+    rentang yang sama bisa terhitung dobel.
+    """
+    start = datetime.combine(date_from, time.min)
+    end = datetime.combine(date_to + timedelta(days=1), time.min)
+
+    def part(table):
+        return select(
+            table.c.location_id,
+            table.c.item_id,
+            table.c.created_at,
+            table.c.reason,
+            table.c.qty_change,
+        ).where(table.c.created_at >= start, table.c.created_at < end)
+
+    movements = union_all(
+        part(models.InventoryMovement.__table__),
+        part(models.InventoryMovementArchive.__table__),
+    ).subquery()
+
+    day = func.date(movements.c.created_at)
+    qty = movements.c.qty_change
+    aggregated = select(
+        movements.c.location_id,
+        day,
+        movements.c.item_id,
+        movements.c.reason,
+        func.sum(case((qty > 0, qty), else_=0)),
+        func.sum(case((qty < 0, -qty), else_=0)),
+        func.sum(qty),
+        func.count(),
+    ).group_by(movements.c.location_id, day, movements.c.item_id, movements.c.reason)
+
+    db.execute(delete(Daily).where(Daily.day >= date_from, Daily.day <= date_to))
+    result = db.execute(
+        insert(Daily).from_select(
+            [
+                "location_id",
+                "day",
+                "item_id",
+                "reason",
+                "qty_in",
+                "qty_out",
+                "net_qty",
+                "movement_count",
+            ],
+            aggregated,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+# ==============================
+# Read path
+# ==============================
+def _filtered(q, location_id, date_from, date_to, item_id, reason):
+    q = q.filter(
+        Daily.location_id == location_id,
+        Daily.day >= date_from,
+        Daily.day <= date_to,
+    )
+    if item_id:
+        q = q.filter(Daily.item_id == item_id)
+    if reason:
+        q = q.filter(Daily.reason == reason)
+    return q
+
+
+def query_daily(
+    db: Session,
+    location_id: int,
+    date_from: date,
+    date_to: date,
+    item_id: int | None = None,
+    reason: str | None = None,
+):
+    q = _filtered(db.query(Daily), location_id, date_from, date_to, item_id, reason)
+    return q.order_by(Daily.day, Daily.item_id, Daily.reason).all()
+
+
+SUMMARY_GROUPS = {
+    "item": (Daily.item_id,),
+    "reason": (Daily.reason,),
+    "item_reason": (Daily.item_id, Daily.reason),
+    "day": (Daily.day,),
+}
+
+
+def query_summary(
+    db: Session,
+    location_id: int,
+    date_from: date,
+    date_to: date,
+    group_by: str = "item",
+    item_id: int | None = None,
+    reason: str | None = None,
+):
+    keys = SUMMARY_GROUPS[group_by]
+    q = db.query(
+        *keys,
+        func.sum(Daily.qty_in).label("qty_in"),
+        func.sum(Daily.qty_out).label("qty_out"),
+        func.sum(Daily.net_qty).label("net_qty"),
+        func.sum(Daily.movement_count).label("movement_count"),
+    )
+    q = _filtered(q, location_id, date_from, date_to, item_id, reason)
+    return q.group_by(*keys).order_by(*keys).all()
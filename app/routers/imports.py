@@ -0,0 +1,62 @@
+import io
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from ..profiling import ProfiledRoute
+from ..database import get_db
+from .. import schemas, bulk_import
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["Bulk Import"],
+    route_class=ProfiledRoute,
+)
+
+
+def _run_import(importer, file: UploadFile, db: Session) -> schemas.ImportReport:
+    fmt = bulk_import.detect_format(file.filename)
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return importer(
+            db,
+            bulk_import.iter_records(stream, fmt),
+            on_progress=bulk_import.log_progress,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except bulk_import.ImportAborted as e:
+        # batch sebelumnya sudah tersimpan; ulangi import setelah database pulih
+        raise HTTPException(
+            status_code=503,
+            detail={"error": str(e), "report": e.report.model_dump()},
+        )
+    finally:
+        stream.detach()
+
+
+@router.post("/items", response_model=schemas.ImportReport)
+def import_items(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    # upsert by sku
+    return _run_import(bulk_import.import_items, file, db)
+
+
+@router.post("/rfid-tags", response_model=schemas.ImportReport)
+def import_rfid_tags(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    # upsert by tag_uid
+    return _run_import(bulk_import.import_rfid_tags, file, db)
+
+
+@router.post("/item-locations", response_model=schemas.ImportReport)
+def import_item_locations(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+):
+    # upsert by (item_id, location_id)
+    return _run_import(bulk_import.import_item_locations, file, db)
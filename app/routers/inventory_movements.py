@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from ..database import get_db
-from .. import schemas, crud, models
+from ..profiling import ProfiledRoute
+from ..database import get_db, get_read_db
+from .. import schemas, crud, models, archive, rollups
 
-router = APIRouter(prefix="/inventory-movements", tags=["Inventory Movements"])
+router = APIRouter(
+    prefix="/inventory-movements",
+    tags=["Inventory Movements"],
+    route_class=ProfiledRoute,
+)
 
 
 @router.post("", response_model=schemas.InventoryMovementResponse)
@@ -22,12 +29,65 @@ def create_movement(
 def list_movements(
     item_id: int | None = None,
     location_id: int | None = None,
-    db: Session = Depends(get_db),
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
 ):
+    if include_archived:
+        return archive.list_movements_with_archive(
+            db, item_id=item_id, location_id=location_id, limit=200
+        )
+
     q = db.query(models.InventoryMovement)
     if item_id:
         q = q.filter(models.InventoryMovement.item_id == item_id)
     if location_id:
         q = q.filter(models.InventoryMovement.location_id == location_id)
     movements = q.order_by(models.InventoryMovement.created_at.desc()).limit(200).all()
-    return movements
\ No newline at end of file
+    return movements
+
+
+def _date_range(date_from: Optional[date], date_to: Optional[date]) -> tuple[date, date]:
+    # default: 90 hari terakhir; rollup day dihitung dari created_at (UTC)
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(days=89)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be before date_to")
+    return date_from, date_to
+
+
+@router.get("/daily", response_model=List[schemas.MovementDailyResponse])
+def list_daily_movements(
+    location_id: int,
+    item_id: int | None = None,
+    reason: str | None = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+):
+    # dibaca dari rollup inventory_movement_daily, bukan raw movements
+    date_from, date_to = _date_range(date_from, date_to)
+    return rollups.query_daily(
+        db, location_id, date_from, date_to, item_id=item_id, reason=reason
+    )
+
+
+@router.get("/summary", response_model=List[schemas.MovementSummaryResponse])
+def summarize_movements(
+    location_id: int,
+    group_by: str = Query("item", pattern="^(item|reason|item_reason|day)$"),
+    item_id: int | None = None,
+    reason: str | None = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+):
+    date_from, date_to = _date_range(date_from, date_to)
+    return rollups.query_summary(
+        db,
+        location_id,
+        date_from,
+        date_to,
+        group_by=group_by,
+        item_id=item_id,
+        reason=reason,
+    )
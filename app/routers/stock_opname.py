@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from ..database import get_db
-from .. import schemas, crud
+from ..profiling import ProfiledRoute
+from ..database import get_db, get_read_db
+from .. import schemas, crud, cache, archive
 
-router = APIRouter(prefix="/stock-opname-sessions", tags=["Stock Opname"])
+router = APIRouter(
+    prefix="/stock-opname-sessions",
+    tags=["Stock Opname"],
+    route_class=ProfiledRoute,
+)
+
+session_list_adapter = TypeAdapter(List[schemas.SessionResponse])
 
 
 def get_current_user_id() -> int:
@@ -27,24 +37,85 @@ def create_session(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/batch")
+def create_sessions_batch(
+    payload: schemas.SessionBatchCreate,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    """
+    Buat sesi untuk banyak lokasi sekaligus (satu snapshot_at).
+    Response berupa NDJSON: baris "sessions", lalu "progress" per chunk
+    snapshot, dan terakhir "done". Sesi yang snapshot-nya gagal dihapus;
+    ulangi dengan location_ids = failed_location_ids dari event "done".
+    """
+    try:
+        snapshot_at, sessions = crud.create_opname_sessions_batch(db, payload, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    created = {
+        "event": "sessions",
+        "snapshot_at": snapshot_at.isoformat(),
+        "sessions": sessions,
+    }
+    bind = db.get_bind()
+    session_ids = [s["id"] for s in sessions]
+
+    def events():
+        yield orjson.dumps(created) + b"\n"
+        for event in crud.snapshot_sessions_parallel(bind, session_ids):
+            yield orjson.dumps(event) + b"\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @router.get("", response_model=List[schemas.SessionResponse])
 def list_sessions(
+    request: Request,
     location_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    sessions = crud.list_sessions(db, location_id=location_id)
-    return sessions
+    version = crud.get_sessions_version(db, location_id=location_id)
+
+    def build() -> bytes:
+        sessions = crud.list_sessions(db, location_id=location_id)
+        return session_list_adapter.dump_json(
+            session_list_adapter.validate_python(sessions, from_attributes=True)
+        )
+
+    return cache.cached_json_response(
+        request,
+        key=("sessions", location_id or None),
+        etag=cache.make_etag("sessions", location_id or None, *version),
+        last_modified=version.modified_at,
+        build=build,
+    )
 
 
 @router.get("/{session_id}", response_model=schemas.SessionResponse)
 def get_session(
     session_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
 ):
-    session = crud.get_session(db, session_id)
-    if not session:
+    version = crud.get_session_version(db, session_id)
+    if not version:
         raise HTTPException(status_code=404, detail="Session not found")
-    return session
+
+    def build() -> bytes:
+        session = crud.get_session(db, session_id)
+        return schemas.SessionResponse.model_validate(
+            session, from_attributes=True
+        ).model_dump_json().encode()
+
+    return cache.cached_json_response(
+        request,
+        key=("session", session_id),
+        etag=cache.make_etag("session", session_id, *version),
+        last_modified=version.modified_at,
+        build=build,
+    )
 
 
 @router.post("/{session_id}/start", response_model=schemas.SessionResponse)
@@ -71,6 +142,24 @@ def submit_scan_batch(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get(
+    "/{session_id}/scans",
+    response_model=list[schemas.ScanResponse],
+)
+def get_session_scans(
+    session_id: int,
+    limit: int = Query(1000, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    # raw scan, termasuk yang sudah dipindah ke archive
+    session = crud.get_session(db, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return archive.get_session_scans(db, session_id, limit=limit, offset=offset)
+
+
 @router.get(
     "/{session_id}/items",
     response_model=list[schemas.StockOpnameItemResponse],
@@ -78,15 +167,17 @@ def submit_scan_batch(
 def get_session_items(
     session_id: int,
     status: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     session = crud.get_session(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    items = crud.get_opname_items_with_item_and_rfid(
+    # angka sudah di-cast di SQL; response_model hanya untuk dokumentasi,
+    # validasi per baris dilewati dan di-encode langsung dengan orjson
+    items = crud.get_opname_items_fast(
         db=db,
         session_id=session_id,
         status=status,
     )
-    return items
\ No newline at end of file
+    return Response(content=orjson.dumps(items), media_type="application/json")
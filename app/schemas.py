@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 
@@ -21,6 +21,16 @@ class SessionCreate(BaseModel):
     notes: Optional[str] = None
 
 
+class SessionBatchCreate(BaseModel):
+    # salah satu: daftar lokasi, atau semua lokasi dengan type tsb
+    location_ids: Optional[List[int]] = None
+    location_type: Optional[str] = None  # "STORE" | "WAREHOUSE"
+    type: str  # "FULL" | "PARTIAL"
+    scheduled_start_at: Optional[datetime] = None
+    scheduled_end_at: Optional[datetime] = None
+    notes: Optional[str] = None
+
+
 class SessionResponse(BaseModel):
     id: int
     code: str
@@ -42,6 +52,19 @@ class ScanBatch(BaseModel):
     tags: List[str]
 
 
+class ScanResponse(BaseModel):
+    id: int
+    session_id: int
+    tag_uid: str
+    item_id: Optional[int]
+    zone: Optional[str]
+    scanned_at: Optional[datetime]
+    scanned_by: Optional[int]
+
+    class Config:
+        orm_mode = True
+
+
 class InventoryMovementCreate(BaseModel):
     item_id: int
     location_id: int
@@ -62,6 +85,32 @@ class InventoryMovementResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class MovementDailyResponse(BaseModel):
+    location_id: int
+    item_id: int
+    day: date
+    reason: str
+    qty_in: Decimal
+    qty_out: Decimal
+    net_qty: Decimal
+    movement_count: int
+
+    class Config:
+        orm_mode = True
+
+
+class MovementSummaryResponse(BaseModel):
+    item_id: Optional[int] = None
+    reason: Optional[str] = None
+    day: Optional[date] = None
+    qty_in: Decimal
+    qty_out: Decimal
+    net_qty: Decimal
+    movement_count: int
+
+    class Config:
+        orm_mode = True
+
 class StockOpnameItemResponse(BaseModel):
     item_id: int
     sku: str
@@ -96,4 +145,15 @@ class StockOpnameItemResponse(BaseModel):
         return int(Decimal(v))
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    rows_read: int = 0
+    rows_upserted: int = 0
+    error_count: int = 0
+    errors: List[ImportRowError] = []
@@ -0,0 +1,200 @@
+"""
+Bandingkan serialisasi response `/stock-opname-sessions/{id}/items`:
+
+- legacy: row Decimal -> StockOpnameItemResponse (field_validator per baris)
+          -> jsonable_encoder -> json.dumps (default FastAPI)
+- fast:   row int (cast di SQL) -> dict -> orjson.dumps
+
+    python benchmarks/items_serialization.py --rows 50000
+    python benchmarks/items_serialization.py --seed --rows 50000
+    python benchmarks/items_serialization.py --session-id 123
+
+Tanpa opsi database, data dibuat sintetis dengan bentuk yang sama seperti
+hasil query (get_opname_items_with_item_and_rfid vs get_opname_items_fast),
+jadi tidak butuh koneksi database. Angka ini hanya batas bawah: query dan
+transfer dari MySQL tidak ikut dihitung.
+
+Dengan --session-id (atau --seed, yang membuat lokasi BENCH-*, item, tag
+dan satu sesi baru lebih dulu) kedua fungsi crud dijalankan end-to-end
+terhadap database dari .env (DB_*). Jangan --seed ke database production.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import orjson  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from sqlalchemy import insert  # noqa: E402
+
+from app import crud, database, models, schemas  # noqa: E402
+
+
+def make_rows(n: int, tags_per_item: int):
+    rnd = random.Random(42)
+    legacy, fast, rfid_map = [], [], {}
+    for item_id in range(1, n + 1):
+        qty = [Decimal(rnd.randint(0, 500)) + Decimal("0.000") for _ in range(5)]
+        value = Decimal(rnd.randint(-50000, 50000)) + Decimal("0.00")
+        status = rnd.choice(["OK", "OVER", "SHORT"])
+        codes = [f"E2800000{item_id:08d}{t:04d}" for t in range(tags_per_item)]
+        rfid_map[item_id] = codes
+
+        legacy.append(
+            {
+                "item_id": item_id,
+                "sku": f"SKU-{item_id:06d}",
+                "name": f"Item {item_id}",
+                "system_qty": qty[0],
+                "movement_qty": qty[1],
+                "effective_qty": qty[2],
+                "counted_qty": qty[3],
+                "variance_qty": qty[4],
+                "variance_value": value,
+                "status": status,
+                "item_codes": codes,
+            }
+        )
+        fast.append(
+            (item_id, f"SKU-{item_id:06d}", f"Item {item_id}",
+             *(int(q) for q in qty), int(value), status)
+        )
+    return legacy, fast, rfid_map
+
+
+def legacy_path(rows) -> bytes:
+    adapter = TypeAdapter(list[schemas.StockOpnameItemResponse])
+    validated = adapter.validate_python(rows)
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fast_path(rows, rfid_map) -> bytes:
+    return orjson.dumps(crud.build_opname_item_dicts(rows, rfid_map))
+
+
+# ==============================
+# Mode database: seed + crud end-to-end
+# ==============================
+def seed_session(db, n: int, tags_per_item: int, chunk: int = 5000) -> int:
+    rnd = random.Random(42)
+    tag = f"{int(time.time())}"
+    location = models.Location(name=f"Benchmark {tag}", code=f"BENCH-{tag}", type="STORE")
+    db.add(location)
+    db.flush()
+
+    for start in range(1, n + 1, chunk):
+        ids = range(start, min(start + chunk, n + 1))
+        db.execute(
+            insert(models.Item),
+            [{"sku": f"BENCH-{tag}-{i:06d}", "name": f"Item {i}"} for i in ids],
+        )
+
+    item_ids = [
+        row[0]
+        for row in db.query(models.Item.id)
+        .filter(models.Item.sku.like(f"BENCH-{tag}-%"))
+        .order_by(models.Item.id)
+    ]
+    for start in range(0, len(item_ids), chunk):
+        ids = item_ids[start:start + chunk]
+        db.execute(
+            insert(models.ItemLocation),
+            [
+                {
+                    "item_id": item_id,
+                    "location_id": location.id,
+                    "system_qty": Decimal(rnd.randint(0, 5000)) / 10,
+                }
+                for item_id in ids
+            ],
+        )
+        db.execute(
+            insert(models.RFIDTag),
+            [
+                {
+                    "tag_uid": f"BENCH{tag}{item_id:010d}{t:04d}",
+                    "item_id": item_id,
+                    "location_id": location.id,
+                    "status": "ACTIVE",
+                }
+                for item_id in ids
+                for t in range(tags_per_item)
+            ],
+        )
+    db.commit()
+
+    session = crud.create_opname_session(
+        db, schemas.SessionCreate(location_id=location.id, type="FULL")
+    )
+    return session.id
+
+
+def db_legacy_path(db, session_id: int) -> bytes:
+    return legacy_path(crud.get_opname_items_with_item_and_rfid(db, session_id))
+
+
+def db_fast_path(db, session_id: int) -> bytes:
+    return orjson.dumps(crud.get_opname_items_fast(db, session_id))
+
+
+def by_item(body: bytes) -> list[dict]:
+    # kedua query tanpa ORDER BY, jadi urutan baris tidak dijamin sama
+    return sorted(json.loads(body), key=lambda r: r["item_id"])
+
+
+def timed(fn, repeat: int) -> tuple[float, bytes]:
+    best, out = float("inf"), b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--tags-per-item", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--session-id", type=int, help="benchmark sesi yang sudah ada di database")
+    source.add_argument("--seed", action="store_true", help="buat data + sesi baru lalu benchmark")
+    args = parser.parse_args()
+
+    if args.session_id or args.seed:
+        db = database.SessionLocal()
+        try:
+            session_id = args.session_id or seed_session(db, args.rows, args.tags_per_item)
+            legacy_s, legacy_body = timed(lambda: db_legacy_path(db, session_id), args.repeat)
+            fast_s, fast_body = timed(lambda: db_fast_path(db, session_id), args.repeat)
+        finally:
+            db.close()
+        label = f"session {session_id} (database, query + serialization)"
+    else:
+        legacy_rows, fast_rows, rfid_map = make_rows(args.rows, args.tags_per_item)
+        legacy_s, legacy_body = timed(lambda: legacy_path(legacy_rows), args.repeat)
+        fast_s, fast_body = timed(lambda: fast_path(fast_rows, rfid_map), args.repeat)
+        label = "synthetic (serialization only, lower bound)"
+
+    fast_rows = by_item(fast_body)
+    if by_item(legacy_body) != fast_rows:
+        print("MISMATCH: fast path output differs from legacy", file=sys.stderr)
+        return 1
+
+    print(label)
+    print(f"rows: {len(fast_rows)}, body: {len(fast_body) / 1e6:.1f} MB (best of {args.repeat})")
+    print(f"legacy (pydantic + json)  {legacy_s * 1000:9.1f} ms")
+    print(f"fast   (sql int + orjson) {fast_s * 1000:9.1f} ms   {legacy_s / fast_s:5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Ukur waktu import `app.main` dan waktu sampai request pertama terjawab,
+masing-masing di process baru (seperti worker uvicorn/gunicorn yang baru start).
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --import-budget 0.8 --startup-budget 1.0
+
+Exit code 1 kalau median melewati budget. Tidak butuh koneksi database.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+
+async def first_request():
+    messages = []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+        "root_path": "", "query_string": b"", "headers": [],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+    }
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        messages.append(message)
+    await app.main.app(scope, receive, send)
+    assert messages[0]["status"] == 200, messages[0]
+
+asyncio.run(first_request())
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "startup": t2 - t0}))
+"""
+
+
+def run_probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int) -> list[tuple[int, str]]:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=1.0, help="seconds")
+    parser.add_argument("--startup-budget", type=float, default=1.5, help="seconds")
+    parser.add_argument("--top", type=int, default=10, help="show N slowest imports")
+    args = parser.parse_args()
+
+    results = [run_probe() for _ in range(args.runs)]
+    import_s = statistics.median(r["import"] for r in results)
+    startup_s = statistics.median(r["startup"] for r in results)
+
+    print(f"import app.main      median {import_s * 1000:8.1f} ms  (budget {args.import_budget * 1000:.0f} ms)")
+    print(f"first response ready median {startup_s * 1000:8.1f} ms  (budget {args.startup_budget * 1000:.0f} ms)")
+
+    if args.top:
+        print("\nslowest imports (cumulative):")
+        for cumulative_us, name in slowest_imports(args.top):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if import_s > args.import_budget or startup_s > args.startup_budget:
+        print("\nOVER BUDGET", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())